@@ -14,7 +14,7 @@ import os
 from scraper.robots import Robots
 from scraper.sitemap import Sitemap
 from scraper.site import scrape_website, store_in_mongodb
-from modules.project_manager import add_project_with_scraping
+from modules.project_manager import add_project_with_scraping, close_http_session, message_timestamp
 from utils.mongodb_utils import serialize_mongo_doc
 from utils.project_utils import get_complete_project_data
 import traceback
@@ -95,6 +95,11 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Close the shared aiohttp session used for keyword checks
+    await close_http_session()
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     error_msg = str(exc)
@@ -272,14 +277,15 @@ async def interrupt_extraction(data: ExtractionInterrupt, user: dict = Depends(g
     if not client_id:
         raise HTTPException(status_code=400, detail="Client ID is required")
     
-    from modules.project_manager import interrupt_extraction, get_extraction_status, active_extractions
+    from modules.project_manager import interrupt_extraction, get_extraction_status, extraction_registry
     
     # Check if extraction exists
-    if client_id not in active_extractions:
+    extraction = extraction_registry.get(client_id)
+    if extraction is None:
         raise HTTPException(status_code=404, detail="No active extraction found with this ID")
     
     # Check if user owns this extraction
-    project_id = active_extractions[client_id].get("project_id")
+    project_id = extraction.get("project_id")
     if project_id:
         project = await projects_collection.find_one({"_id": ObjectId(project_id)})
         if not project or project.get("user_email") != user["email"]:
@@ -290,10 +296,10 @@ async def interrupt_extraction(data: ExtractionInterrupt, user: dict = Depends(g
     
     if result:
         # Send WebSocket message about interruption
-        if client_id in active_extractions:
+        if client_id in extraction_registry:
             await manager.send_personal_json({
                 "type": "system",
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": message_timestamp(),
                 "message": "Extraction interrupt requested. The process will stop at the next safe point."
             }, client_id)
         
@@ -307,14 +313,15 @@ async def get_extraction_status_endpoint(client_id: str, user: dict = Depends(ge
     if not client_id:
         raise HTTPException(status_code=400, detail="Client ID is required")
     
-    from modules.project_manager import get_extraction_status, active_extractions
+    from modules.project_manager import get_extraction_status, extraction_registry
     
     # Check if extraction exists
-    if client_id not in active_extractions:
+    extraction = extraction_registry.get(client_id)
+    if extraction is None:
         raise HTTPException(status_code=404, detail="No active extraction found with this ID")
     
     # Check if user owns this extraction
-    project_id = active_extractions[client_id].get("project_id")
+    project_id = extraction.get("project_id")
     if project_id:
         project = await projects_collection.find_one({"_id": ObjectId(project_id)})
         if not project or project.get("user_email") != user["email"]:
@@ -341,7 +348,7 @@ async def websocket_endpoint(websocket: WebSocket, client_id: str):
                     if interrupt_extraction(client_id):
                         await manager.send_personal_json({
                             "type": "system",
-                            "timestamp": datetime.utcnow().isoformat(),
+                            "timestamp": message_timestamp(),
                             "message": "Extraction interrupt requested via WebSocket"
                         }, client_id)
             except:
@@ -469,7 +476,7 @@ async def add_project_with_scraping_route(project: ProjectURL, user: dict = Depe
         await manager.send_personal_json({
             "type": "system",
             "message": "Checking if website allows scraping...",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": message_timestamp()
         }, client_id)
         
         # Fetch robots.txt
@@ -486,7 +493,7 @@ async def add_project_with_scraping_route(project: ProjectURL, user: dict = Depe
         await manager.send_personal_json({
             "type": "system",
             "message": f"Scraping permission check: {can_scrape_result}",
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": message_timestamp(),
             "details": {
                 "robots_found": robots_content is not None,
                 "terms_url": terms_url
@@ -498,7 +505,7 @@ async def add_project_with_scraping_route(project: ProjectURL, user: dict = Depe
             await manager.send_personal_json({
                 "type": "error",
                 "message": "This website does not allow scraping based on robots.txt or terms of service.",
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": message_timestamp()
             }, client_id)
             
             return {
@@ -511,7 +518,7 @@ async def add_project_with_scraping_route(project: ProjectURL, user: dict = Depe
         await manager.send_personal_json({
             "type": "system",
             "message": "Website allows scraping. Proceeding with analysis...",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": message_timestamp()
         }, client_id)
         
         # Pass the manager and max_depth to the function
@@ -1,50 +1,186 @@
 from scraper.robots import Robots
 from scraper.sitemap import Sitemap
-from scraper.site import scrape_website, store_in_mongodb
+from scraper.site import scrape_website, store_in_mongodb, store_many_in_mongodb
 from motor.motor_asyncio import AsyncIOMotorClient
 from fastapi import HTTPException
 import datetime
 from bson import ObjectId
 import traceback
+import logging
+import os
 import threading
 import asyncio
 import concurrent.futures
-import queue
 from queue import Queue
-import json
+import orjson
 import uuid
+import atexit
+import functools
 import time
 import math
 from utils.websocket_manager import ConnectionManager
 import re
-import requests
+import bisect
+import aiohttp
 from bs4 import BeautifulSoup
 from urllib.parse import urlparse
 from pymongo import MongoClient
+from pymongo.write_concern import WriteConcern
 from typing import Optional, List
+from types import MappingProxyType
+
+logger = logging.getLogger(__name__)
+
+# Full tracebacks for per-page errors are only logged when DEBUG_EXTRACT is set
+DEBUG_EXTRACT = bool(os.environ.get("DEBUG_EXTRACT"))
 
 client = AsyncIOMotorClient("mongodb://localhost:27017")
 db = client.hackathon
 projects_collection = db.projects
 users_collection = db.users
 
+# Synchronous client shared by the extraction threads and sync helpers, created once at import
+sync_client = MongoClient("mongodb://localhost:27017", maxPoolSize=50, minPoolSize=5)
+atexit.register(sync_client.close)
+sync_projects = sync_client.hackathon.projects
+# Unacknowledged (w=0) writes for idempotent progress updates; creation and
+# final status updates go through sync_projects and stay acknowledged
+sync_progress_projects = sync_projects.with_options(write_concern=WriteConcern(w=0))
+
 # Global thread pool for extraction tasks
 thread_pool = concurrent.futures.ThreadPoolExecutor(max_workers=5)
-# Message queue for extraction logs
-message_queues = {}
-# Dictionary to track active extraction processes with interrupt flags
-active_extractions = {}
-# Dictionary to track detailed extraction statistics
-extraction_stats = {}
+# Shared aiohttp session for keyword checks, created on the main event loop
+http_session = None
+# Limits concurrent keyword-check fetches across all extractions
+keyword_semaphore = None
+# Event loop that owns the message queues, captured when a project starts
+main_loop = None
+# Number of log messages dropped per client while its queue was full
+dropped_logs = {}
 
 MAX_MONGODB_DOC_SIZE = 12 * 1024 * 1024  # 12MB document size limit
 CHUNK_SIZE = 100  # Number of items per chunk
+KEYWORD_PIPELINE_SIZE = 32  # Keyword checks kept in flight ahead of scraping
+KEYWORD_FETCH_CONCURRENCY = 16  # Max keyword-check fetches in flight
+KEYWORD_MAX_BODY_SIZE = 2 * 1024 * 1024  # Bytes of each page read for the keyword check
+STORE_BATCH_SIZE = 50  # Scraped pages buffered before a bulk write
+STORE_FLUSH_INTERVAL = 2  # Max seconds a scraped page waits in the buffer
+# Separates page text from meta data in the combined keyword scan
+META_SEPARATOR = "\n<<META>>\n"
+MESSAGE_QUEUE_SIZE = 1024  # Max pending WebSocket messages per client
+CRITICAL_PUT_TIMEOUT = 5  # Seconds a worker waits to deliver a critical message
+FINISHED_EXTRACTION_TTL = 300  # Seconds a finished extraction stays in the registry
+# Message types that are never dropped when a client's queue is full
+CRITICAL_MESSAGE_TYPES = ("error", "completion")
 
 # Status constants
 STATUS_RUNNING = "running"
 STATUS_INTERRUPTED = "interrupted"
 STATUS_COMPLETED = "completed"
 STATUS_ERROR = "error"
+TERMINAL_STATUSES = (STATUS_COMPLETED, STATUS_ERROR, STATUS_INTERRUPTED)
+
+class ExtractionRegistry:
+    """
+    Thread-safe store for active extractions, their statistics and message queues.
+    The event loop and the extraction threads both read and update these, so every
+    access goes through a single lock and callers only ever get copies back.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._extractions = {}
+        self._stats = {}
+        self._queues = {}
+    
+    def register(self, client_id, project_id, stats):
+        """Register a new extraction with its initial statistics"""
+        with self._lock:
+            self._extractions[client_id] = {
+                "project_id": project_id,
+                "status": STATUS_RUNNING,
+                "interrupt_requested": False,
+                "last_updated": datetime.datetime.utcnow()
+            }
+            self._stats[client_id] = dict(stats)
+    
+    def unregister(self, client_id):
+        """Forget an extraction along with its statistics and message queue"""
+        with self._lock:
+            self._extractions.pop(client_id, None)
+            self._stats.pop(client_id, None)
+            self._queues.pop(client_id, None)
+    
+    def __contains__(self, client_id):
+        with self._lock:
+            return client_id in self._extractions
+    
+    def get(self, client_id):
+        """Return a copy of the extraction entry, or None if it is unknown"""
+        with self._lock:
+            entry = self._extractions.get(client_id)
+            return dict(entry) if entry is not None else None
+    
+    def get_snapshot(self, client_id):
+        """Return (status, interrupt_requested) read under one lock; status is None if unknown"""
+        with self._lock:
+            entry = self._extractions.get(client_id)
+            if entry is None:
+                return None, False
+            return entry["status"], entry.get("interrupt_requested", False)
+    
+    def update(self, client_id, **fields):
+        """
+        Update fields of a registered extraction; returns False if it is unknown.
+        last_updated defaults to now unless the caller passes its own timestamp.
+        """
+        with self._lock:
+            entry = self._extractions.get(client_id)
+            if entry is None:
+                return False
+            entry["last_updated"] = datetime.datetime.utcnow()
+            entry.update(fields)
+            return True
+    
+    def set_queue(self, client_id, queue):
+        with self._lock:
+            self._queues[client_id] = queue
+    
+    def get_queue(self, client_id):
+        with self._lock:
+            return self._queues.get(client_id)
+    
+    def remove_queue_if_done(self, client_id, queue):
+        """Drop the client's queue if its extraction has finished and the queue is drained"""
+        with self._lock:
+            entry = self._extractions.get(client_id)
+            if entry is not None and entry["status"] not in TERMINAL_STATUSES:
+                return False
+            if not queue.empty():
+                return False
+            if self._queues.get(client_id) is queue:
+                del self._queues[client_id]
+            return True
+    
+    def set_stats(self, client_id, stats):
+        with self._lock:
+            self._stats[client_id] = dict(stats)
+    
+    def update_stats(self, client_id, **fields):
+        with self._lock:
+            if client_id in self._stats:
+                self._stats[client_id].update(fields)
+    
+    def get_with_stats(self, client_id):
+        """Return copies of the extraction entry and its statistics (either may be None)"""
+        with self._lock:
+            entry = self._extractions.get(client_id)
+            stats = self._stats.get(client_id)
+            return (dict(entry) if entry is not None else None,
+                    dict(stats) if stats is not None else None)
+
+# Active extractions, their statistics and message queues
+extraction_registry = ExtractionRegistry()
 
 async def consume_messages(client_id, ws_manager):
     """
@@ -52,61 +188,64 @@ async def consume_messages(client_id, ws_manager):
     If WebSocket disconnects, logs will be stored until connection is re-established
     or until extraction completes.
     """
-    if client_id not in message_queues:
+    q = extraction_registry.get_queue(client_id)
+    if q is None:
         print(f"No message queue found for client {client_id}")
         return
-    
-    q = message_queues[client_id]
+
     msg_buffer = []  # Buffer for messages that couldn't be sent due to disconnection
-    
+
     try:
         print(f"Starting message consumer for client {client_id}")
         while True:
             try:
-                # Use a non-blocking get with timeout
+                # Once the client has caught up, tell it how many logs were skipped
+                dropped = dropped_logs.get(client_id, 0)
+                if dropped and q.qsize() < q.maxsize // 2:
+                    dropped_logs[client_id] = 0
+                    await ws_manager.send_personal_serialized_json(orjson.dumps({
+                        "type": "backpressure",
+                        "dropped": dropped,
+                        "message": f"{dropped} log messages were skipped because the connection could not keep up",
+                        "timestamp": message_timestamp()
+                    }), client_id)
+                
                 try:
-                    message = q.get(block=False)
-                    
-                    # Try to send the message via WebSocket
-                    try:
-                        await ws_manager.send_personal_json(message, client_id)
-                        # Message was sent successfully
-                        q.task_done()
-                    except Exception as ws_err:
-                        # WebSocket error - store message in buffer
-                        print(f"WebSocket send error for client {client_id}: {str(ws_err)}")
-                        msg_buffer.append(message)
-                        q.task_done()
-                        
-                except queue.Empty:
+                    # Wait for the next message; the timeout only exists so we can
+                    # notice a finished extraction while the queue is idle
+                    message = await asyncio.wait_for(q.get(), timeout=1.0)
+                except asyncio.TimeoutError:
                     # No new messages, try to send any buffered messages if connection is available
-                    if msg_buffer and client_id in ws_manager.active_connections:
+                    while msg_buffer and client_id in ws_manager.active_connections:
                         try:
-                            # Try to send the oldest buffered message
-                            await ws_manager.send_personal_json(msg_buffer[0], client_id)
-                            # If successful, remove from buffer
+                            await ws_manager.send_personal_serialized_json(msg_buffer[0], client_id)
                             msg_buffer.pop(0)
                             print(f"Sent buffered message to client {client_id}, {len(msg_buffer)} messages remaining")
                         except Exception as buffer_err:
-                            # Still can't send, wait and try again later
+                            # Still can't send, try again on the next idle tick
                             print(f"Failed to send buffered message: {buffer_err}")
-                    
-                    # Wait a bit before checking again
-                    await asyncio.sleep(0.1)
-                    
-                    # Check if extraction is done and all messages have been processed
-                    if (client_id not in active_extractions or 
-                        active_extractions[client_id]["status"] in [STATUS_COMPLETED, STATUS_ERROR, STATUS_INTERRUPTED]):
-                        # If queue is empty and all buffered messages were sent, exit the loop
-                        if q.empty() and not msg_buffer:
-                            print(f"Consumer for {client_id} exiting - extraction complete and all messages delivered")
-                            if client_id in message_queues:
-                                del message_queues[client_id]
                             break
-                        # If messages remain but extraction is complete, try again with backoff
-                        await asyncio.sleep(0.5)
+
+                    # Check if extraction is done and all messages have been processed
+                    # If queue is empty and all buffered messages were sent, exit the loop
+                    if not msg_buffer and extraction_registry.remove_queue_if_done(client_id, q):
+                        print(f"Consumer for {client_id} exiting - extraction complete and all messages delivered")
+                        dropped_logs.pop(client_id, None)
+                        # Keep the finished extraction around a while for status polls, then forget it
+                        asyncio.get_running_loop().call_later(
+                            FINISHED_EXTRACTION_TTL, extraction_registry.unregister, client_id
+                        )
+                        break
                     continue
-                    
+
+                # Try to send the message via WebSocket
+                try:
+                    await ws_manager.send_personal_serialized_json(message, client_id)
+                except Exception as ws_err:
+                    # WebSocket error - store message in buffer
+                    print(f"WebSocket send error for client {client_id}: {str(ws_err)}")
+                    msg_buffer.append(message)
+
             except Exception as e:
                 print(f"Error in message consumer for {client_id}: {str(e)}")
                 print(traceback.format_exc())
@@ -116,157 +255,316 @@ async def consume_messages(client_id, ws_manager):
         print(traceback.format_exc())
     print(f"Message consumer for {client_id} has ended")
 
-def send_log(client_id, log_type, message):
-    """Add a log message to the client's message queue"""
-    if client_id not in message_queues:
+def _put_message(client_id, message_type, payload):
+    """
+    Put a serialized message on the client's queue without blocking. Runs on the event loop.
+    Messages that don't fit are counted; the consumer reports them as a single backpressure notice.
+    """
+    q = extraction_registry.get_queue(client_id)
+    if q is None:
+        return False
+    
+    try:
+        q.put_nowait(payload)
+        return True
+    except asyncio.QueueFull:
+        if message_type in CRITICAL_MESSAGE_TYPES:
+            # Critical messages wait for room instead of being dropped
+            asyncio.ensure_future(q.put(payload))
+            return True
+        dropped_logs[client_id] = dropped_logs.get(client_id, 0) + 1
+        return False
+
+def _on_main_loop():
+    """Check whether the caller is running on the loop that owns the message queues"""
+    try:
+        return asyncio.get_running_loop() is main_loop
+    except RuntimeError:
+        return False
+
+def enqueue_message(client_id, message):
+    """
+    Hand a message to the client's asyncio queue; safe to call from worker threads.
+    The message is serialized with orjson by the caller, so the event loop only sends bytes.
+    Non-critical messages are dropped when the queue is full, while critical ones
+    block the calling worker until the consumer makes room. While there is room,
+    nothing blocks the worker.
+    """
+    q = extraction_registry.get_queue(client_id)
+    if q is None or main_loop is None:
         print(f"No message queue found for client {client_id}")
         return
     
-    log_entry = {
-        "type": log_type,
-        "message": message,
-        "timestamp": datetime.datetime.utcnow().isoformat()
-    }
-    
     try:
-        message_queues[client_id].put(log_entry)
+        message_type = message.get("type")
+        payload = orjson.dumps(message)
+        if _on_main_loop():
+            _put_message(client_id, message_type, payload)
+        elif message_type in CRITICAL_MESSAGE_TYPES and q.full():
+            future = asyncio.run_coroutine_threadsafe(q.put(payload), main_loop)
+            try:
+                future.result(timeout=CRITICAL_PUT_TIMEOUT)
+            except concurrent.futures.TimeoutError:
+                future.cancel()
+                print(f"Timed out delivering {message_type} message to client {client_id}")
+        else:
+            main_loop.call_soon_threadsafe(_put_message, client_id, message_type, payload)
     except Exception as e:
-        print(f"Error adding log to queue for client {client_id}: {str(e)}")
+        print(f"Error adding message to queue for client {client_id}: {str(e)}")
 
-def check_page_for_keywords(url, keywords, include_meta=True):
-    """Check if a page contains any of the specified keywords in all content including cards, text, and images"""
-    try:
-        # Initialize results
-        contains_keywords = False
-        found_keywords = []
-        meta_info = {}
-        keyword_contexts = {}
-        
-        # Fetch the page content
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36"
-        }
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
+def message_timestamp():
+    """
+    Timestamp for WebSocket messages, in epoch milliseconds. Every message on
+    the channel uses it; the client formats it for display.
+    """
+    return time.time_ns() // 1_000_000
+
+def send_log(client_id, log_type, message):
+    """Add a log message to the client's message queue"""
+    enqueue_message(client_id, {
+        "type": log_type,
+        "message": message,
+        "timestamp": message_timestamp()
+    })
+
+def build_keyword_pattern(keywords):
+    """
+    Compile one case-insensitive pattern matching any of the keywords, longest first.
+    Empty and whitespace-only keywords are ignored; returns None if no keyword is left.
+    """
+    ordered = sorted({keyword for keyword in keywords if keyword.strip()}, key=len, reverse=True)
+    if not ordered:
+        return None
+    return re.compile("|".join(re.escape(keyword) for keyword in ordered), re.IGNORECASE)
+
+def build_keyword_lookup(keywords):
+    """Map each lowercased keyword to the keyword as the user entered it, skipping empty keywords"""
+    return {keyword.lower(): keyword for keyword in keywords if keyword.strip()}
+
+def scan_page_for_keywords(content, keyword_lookup, keyword_pattern, include_meta=True):
+    """
+    Scan fetched page HTML for the keywords in text, cards, images and meta tags.
+    keyword_lookup and keyword_pattern are built once per extraction, not per page.
+    """
+    # Initialize results
+    contains_keywords = False
+    found_keywords = []
+    meta_info = {}
+    keyword_contexts = {}
+    
+    # Parse the whole page: text can sit in any element, not just the common ones
+    soup = BeautifulSoup(content, 'lxml')
+    
+    # Extract text content
+    text_content = soup.get_text(separator=' ', strip=True)
+    
+    # Collect the title and meta tags as (context label, content) pairs
+    meta_entries = []
+    if include_meta:
+        # Extract meta title
+        title_tag = soup.find('title')
+        if title_tag:
+            meta_info['title'] = title_tag.get_text()
+            meta_entries.append(("Title", meta_info['title']))
         
-        # Parse the HTML
-        soup = BeautifulSoup(response.content, 'html.parser')
+        # Meta description and keywords
+        for meta_tag in soup.find_all('meta'):
+            meta_name = meta_tag.get('name', '').lower()
+            meta_content = meta_tag.get('content', '')
+            
+            if meta_name in ['description', 'keywords'] and meta_content:
+                meta_info[meta_name] = meta_content
+                meta_entries.append((f"Meta {meta_name}", meta_content))
         
-        # Extract text content
-        text_content = soup.get_text(separator=' ', strip=True).lower()
+        # Also Open Graph and Twitter card tags
+        for meta_tag in soup.find_all('meta', property=True):
+            meta_prop = meta_tag.get('property', '').lower()
+            
+            if 'og:' in meta_prop or 'twitter:' in meta_prop:
+                prop_type = 'Open Graph' if 'og:' in meta_prop else 'Twitter'
+                meta_info[meta_prop] = meta_tag.get('content')
+                meta_entries.append((prop_type, meta_tag.get('content') or ''))
+    
+    # Scan text and meta data in one pass: the meta entries follow the text after a
+    # separator, and a match's offset tells which part (and which meta entry) it is in
+    text_length = len(text_content)
+    meta_offset = text_length + len(META_SEPARATOR)
+    meta_starts = []
+    position = meta_offset
+    for _, meta_content in meta_entries:
+        meta_starts.append(position)
+        position += len(meta_content) + 1
+    full_text = text_content + META_SEPARATOR + "\n".join(meta_content for _, meta_content in meta_entries)
+    
+    # Meta contexts take precedence over text, image and card contexts
+    meta_contexts = {}
+    search_from = 0
+    while search_from <= len(full_text):
+        match = keyword_pattern.search(full_text, search_from)
+        if match is None:
+            break
+        # Resume right after the match start rather than its end, so keywords that
+        # overlap the match (e.g. "york city" in "new york city") are still found
+        search_from = match.start() + 1
+        keyword = keyword_lookup.get(match.group(0).lower())
+        if keyword is None:
+            continue
         
-        # Check for keywords in main content
-        for keyword in keywords:
-            keyword_lower = keyword.lower()
-            if keyword_lower in text_content:
+        if match.start() >= meta_offset:
+            contains_keywords = True
+            if keyword not in found_keywords:
+                found_keywords.append(keyword)
+            label, meta_content = meta_entries[bisect.bisect_right(meta_starts, match.start()) - 1]
+            meta_contexts[keyword] = f"{label}: {meta_content}"
+        elif match.end() <= text_length:
+            contains_keywords = True
+            if keyword in found_keywords:  # Avoid duplicates, first match gives the context
+                continue
+            found_keywords.append(keyword)
+            
+            # Get context for keyword (text around the keyword)
+            context_start = max(0, match.start() - 50)
+            context_end = min(text_length, match.end() + 50)
+            context = text_content[context_start:context_end].replace('\n', ' ').strip()
+            keyword_contexts[keyword] = f"...{context}..."
+            
+            # Every keyword has its first hit, later text matches can't add anything
+            if len(found_keywords) == len(keyword_lookup):
+                search_from = meta_offset
+    
+    # A keyword inside a longer keyword is hidden by the longer match, but is still on the page
+    for keyword_lower, keyword in keyword_lookup.items():
+        if keyword in found_keywords:
+            continue
+        for found in list(found_keywords):
+            if keyword_lower in found.lower():
+                found_keywords.append(keyword)
+                if found in meta_contexts:
+                    meta_contexts[keyword] = meta_contexts[found]
+                else:
+                    keyword_contexts[keyword] = keyword_contexts[found]
+                break
+    
+    # Check specialized elements (cards, images, etc.) regardless of previous matches
+    
+    # Check image alt texts specifically
+    for img in soup.find_all('img', alt=True):
+        alt_text = img['alt'].lower()
+        for keyword_lower, keyword in keyword_lookup.items():
+            if keyword_lower in alt_text:
                 contains_keywords = True
-                if keyword not in found_keywords:  # Avoid duplicates
+                if keyword not in found_keywords:
                     found_keywords.append(keyword)
-                
-                # Get context for keyword (text around the keyword)
-                start_idx = text_content.find(keyword_lower)
-                if start_idx != -1:
-                    context_start = max(0, start_idx - 50)
-                    context_end = min(len(text_content), start_idx + len(keyword) + 50)
-                    context = text_content[context_start:context_end].replace('\n', ' ').strip()
-                    keyword_contexts[keyword] = f"...{context}..."
-        
-        # Check specialized elements (cards, images, etc.) regardless of previous matches
-        
-        # Check image alt texts specifically
-        for img in soup.find_all('img', alt=True):
-            alt_text = img['alt'].lower()
-            for keyword in keywords:
-                keyword_lower = keyword.lower()
-                if keyword_lower in alt_text:
+                keyword_contexts[keyword] = f"Image alt: {img['alt']}"
+    
+    # Check common card elements and other components
+    card_selectors = [
+        '.card', '[class*="card"]', '.product', '.item', 
+        '[class*="product"]', '[class*="item"]', 'article',
+        '.listing', '[class*="listing"]'
+    ]
+    
+    for selector in card_selectors:
+        for card in soup.select(selector):
+            card_text = card.get_text(separator=' ', strip=True).lower()
+            
+            # Check for keywords in card content
+            for keyword_lower, keyword in keyword_lookup.items():
+                if keyword_lower in card_text:
                     contains_keywords = True
                     if keyword not in found_keywords:
                         found_keywords.append(keyword)
-                    keyword_contexts[keyword] = f"Image alt: {img['alt']}"
-        
-        # Check common card elements and other components
-        card_selectors = [
-            '.card', '[class*="card"]', '.product', '.item', 
-            '[class*="product"]', '[class*="item"]', 'article',
-            '.listing', '[class*="listing"]'
-        ]
-        
-        for selector in card_selectors:
-            for card in soup.select(selector):
-                card_text = card.get_text(separator=' ', strip=True).lower()
-                
-                # Check for keywords in card content
-                for keyword in keywords:
-                    keyword_lower = keyword.lower()
-                    if keyword_lower in card_text:
-                        contains_keywords = True
-                        if keyword not in found_keywords:
-                            found_keywords.append(keyword)
-                        
-                        # Try to get more specific context within the card
-                        card_title = card.find(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', '.title', '.heading'])
-                        if card_title:
-                            title_text = card_title.get_text(strip=True)
-                            keyword_contexts[keyword] = f"Card title: {title_text}"
-                        else:
-                            # Just use the card text if no specific element found
-                            context_part = card_text[:100] + "..." if len(card_text) > 100 else card_text
-                            keyword_contexts[keyword] = f"Card content: {context_part}"
-        
-        # If include_meta is True, check meta tags as well (regardless of previous matches)
-        if include_meta:
-            # Extract meta title
-            title_tag = soup.find('title')
-            if title_tag:
-                title_text = title_tag.get_text().lower()
-                meta_info['title'] = title_tag.get_text()
-                
-                # Check title for keywords
-                for keyword in keywords:
-                    keyword_lower = keyword.lower()
-                    if keyword_lower in title_text:
-                        contains_keywords = True
-                        if keyword not in found_keywords:
-                            found_keywords.append(keyword)
-                        keyword_contexts[keyword] = f"Title: {title_tag.get_text()}"
-            
-            # Check meta description and keywords
-            for meta_tag in soup.find_all('meta'):
-                meta_name = meta_tag.get('name', '').lower()
-                meta_content = meta_tag.get('content', '').lower()
-                
-                if meta_name in ['description', 'keywords'] and meta_content:
-                    meta_info[meta_name] = meta_tag.get('content')
                     
-                    for keyword in keywords:
-                        keyword_lower = keyword.lower()
-                        if keyword_lower in meta_content:
-                            contains_keywords = True
-                            if keyword not in found_keywords:
-                                found_keywords.append(keyword)
-                            keyword_contexts[keyword] = f"Meta {meta_name}: {meta_tag.get('content')}"
-            
-            # Also check Open Graph and Twitter card tags
-            for meta_tag in soup.find_all('meta', property=True):
-                meta_prop = meta_tag.get('property', '').lower()
-                meta_content = meta_tag.get('content', '').lower()
+                    # Try to get more specific context within the card
+                    card_title = card.find(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', '.title', '.heading'])
+                    if card_title:
+                        title_text = card_title.get_text(strip=True)
+                        keyword_contexts[keyword] = f"Card title: {title_text}"
+                    else:
+                        # Just use the card text if no specific element found
+                        context_part = card_text[:100] + "..." if len(card_text) > 100 else card_text
+                        keyword_contexts[keyword] = f"Card content: {context_part}"
+    
+    # Meta matches were found in the combined scan above
+    keyword_contexts.update(meta_contexts)
+    
+    return contains_keywords, found_keywords, meta_info, keyword_contexts
+
+async def get_http_session():
+    """Get the shared aiohttp session, creating it on the main event loop on first use"""
+    global http_session, keyword_semaphore
+    if http_session is None or http_session.closed:
+        http_session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=32))
+        keyword_semaphore = asyncio.Semaphore(KEYWORD_FETCH_CONCURRENCY)
+    return http_session
+
+def truncate_body(content, limit):
+    """
+    Cut a page body to at most limit bytes without splitting a UTF-8 character,
+    so encoding detection still sees valid UTF-8 when the page has no charset.
+    """
+    if len(content) <= limit:
+        return content
+    content = content[:limit]
+    if not content:
+        return content
+    # Walk back over continuation bytes to the start of the last character
+    start = len(content) - 1
+    while start > 0 and len(content) - start < 4 and content[start] & 0xC0 == 0x80:
+        start -= 1
+    lead = content[start]
+    if lead >= 0xF0:
+        needed = 4
+    elif lead >= 0xE0:
+        needed = 3
+    elif lead >= 0xC0:
+        needed = 2
+    else:
+        needed = 1
+    # Drop the last character if it was cut short
+    if len(content) - start < needed:
+        content = content[:start]
+    return content
+
+async def close_http_session():
+    """Close the shared aiohttp session; called when the app shuts down"""
+    global http_session
+    if http_session is not None and not http_session.closed:
+        await http_session.close()
+    http_session = None
+
+async def check_page_for_keywords(url, keyword_lookup, keyword_pattern, include_meta=True):
+    """Check if a page contains any of the specified keywords in all content including cards, text, and images"""
+    try:
+        session = await get_http_session()
+        
+        # Fetch the page content
+        headers = {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36"
+        }
+        async with keyword_semaphore:
+            async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=15)) as response:
+                response.raise_for_status()
                 
-                if 'og:' in meta_prop or 'twitter:' in meta_prop:
-                    prop_type = 'Open Graph' if 'og:' in meta_prop else 'Twitter'
-                    meta_info[meta_prop] = meta_tag.get('content')
-                    
-                    for keyword in keywords:
-                        keyword_lower = keyword.lower()
-                        if keyword_lower in meta_content:
-                            contains_keywords = True
-                            if keyword not in found_keywords:
-                                found_keywords.append(keyword)
-                            keyword_contexts[keyword] = f"{prop_type}: {meta_tag.get('content')}"
+                # Stream the body and stop at the size cap; the keyword check
+                # doesn't need the tail of very large pages
+                chunks = []
+                size = 0
+                async for chunk in response.content.iter_chunked(64 * 1024):
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if size >= KEYWORD_MAX_BODY_SIZE:
+                        break
+                content = truncate_body(b"".join(chunks), KEYWORD_MAX_BODY_SIZE)
         
-        return contains_keywords, found_keywords, meta_info, keyword_contexts
+        # Parsing is CPU-bound, keep it off the event loop
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, scan_page_for_keywords, content, keyword_lookup, keyword_pattern, include_meta)
     
     except Exception as e:
         print(f"Error checking keywords for {url}: {str(e)}")
+        if DEBUG_EXTRACT:
+            logger.exception(f"Error checking keywords for {url}")
         return False, [], {}, {}
 
 async def add_project_with_scraping(
@@ -306,7 +604,7 @@ async def add_project_with_scraping(
             "pages_limit": pages_limit,  # Use dynamic limit
             "search_keywords": search_keywords or [],
             "include_meta": include_meta,
-            "keyword_matches": {},  # Add a place to store keyword matches
+            "keyword_matches": [],  # Add a place to store keyword matches
             "max_depth": max_depth,  # Store the max crawling depth
             "recursive_crawling": True  # Enable recursive crawling
         }
@@ -338,16 +636,8 @@ async def add_project_with_scraping(
         if not client_id:
             client_id = f"project_{str(project_id)}"
         
-        # Register in active extractions with initial status
-        active_extractions[client_id] = {
-            "project_id": str(project_id),
-            "status": STATUS_RUNNING,
-            "interrupt_requested": False,
-            "last_updated": datetime.datetime.utcnow()
-        }
-        
-        # Initialize extraction statistics
-        extraction_stats[client_id] = {
+        # Register in active extractions with initial status and statistics
+        extraction_registry.register(client_id, str(project_id), {
             "start_time": datetime.datetime.utcnow(),
             "robots_time": 0,
             "sitemap_time": 0,
@@ -357,11 +647,13 @@ async def add_project_with_scraping(
             "bytes_processed": 0,
             "total_elements_extracted": 0,
             "chunks_processed": 0
-        }
+        })
         
-        # Create a thread-specific message queue
+        # Create a message queue fed from the extraction thread
         if ws_manager:
-            message_queues[client_id] = queue.Queue()
+            global main_loop
+            main_loop = asyncio.get_running_loop()
+            extraction_registry.set_queue(client_id, asyncio.Queue(maxsize=MESSAGE_QUEUE_SIZE))
             
             # Start message consumer in a separate task
             asyncio.create_task(consume_messages(client_id, ws_manager))
@@ -405,7 +697,7 @@ def extract_links_from_html(html_content, base_url):
     Extract all links from the HTML content and normalize them
     """
     try:
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = BeautifulSoup(html_content, 'lxml')
         links = set()
         
         # Parse base URL for normalization
@@ -595,13 +887,9 @@ def run_extraction_thread(
     connection is lost or the user navigates away from the page.
     """
     print(f"Starting extraction thread for {url} with client_id {client_id}")
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
     
-    # Create a thread-local MongoDB client
-    thread_client = AsyncIOMotorClient("mongodb://localhost:27017")
-    thread_db = thread_client.hackathon
-    thread_projects_collection = thread_db.projects
+    # Convert once; the shared sync client is used for all project updates
+    project_oid = _oid(project_id)
     
     # Track visited URLs to avoid duplicates
     visited_urls = set()
@@ -609,6 +897,8 @@ def run_extraction_thread(
     keyword_matched_urls = set()
     # Queue for URLs to visit with their depth level
     url_queue = Queue()
+    # Every URL ever put on the queue, so the same link isn't queued twice
+    queued_urls = {url}
     # Initial URL with depth 0
     url_queue.put((url, 0))
     base_domain = urlparse(url).netloc
@@ -616,14 +906,28 @@ def run_extraction_thread(
     # Initialize tracking variables
     pages_checked = 0
     scraped_pages = []
-    keyword_matches = {}
+    keyword_matches = []  # URLs may contain dots, so matches are not keyed by URL
     keyword_contexts = {}
     meta_info_extracted = {}
     pages_with_keywords = 0
-    all_extracted_links = {}  # Dictionary to track extracted links
+    # Keyword matchers built once for the whole extraction
+    keyword_lookup = build_keyword_lookup(search_keywords or [])
+    keyword_pattern = build_keyword_pattern(search_keywords or [])
+    # Scraped pages waiting to be written to MongoDB in one batch
+    store_buffer = []
+    last_flush = time.time()
+    
+    def flush_store_buffer():
+        """Write all buffered pages to MongoDB"""
+        nonlocal last_flush
+        if store_buffer:
+            stored = store_many_in_mongodb(store_buffer)
+            send_log(client_id, "detail", f"Saved {stored} of {len(store_buffer)} pages to the database")
+            store_buffer.clear()
+        last_flush = time.time()
 
     # Update extraction stats to track progress
-    extraction_stats[client_id] = {
+    extraction_registry.set_stats(client_id, {
         "start_time": datetime.datetime.utcnow(),
         "robots_time": 0,
         "sitemap_time": 0,
@@ -635,7 +939,7 @@ def run_extraction_thread(
         "chunks_processed": 0,
         "last_updated": datetime.datetime.utcnow().isoformat(),
         "is_background": True
-    }
+    })
     
     try:
         # Initialize processing status
@@ -657,10 +961,10 @@ def run_extraction_thread(
             "stats_tracking_enabled": True  # Enable detailed statistics tracking
         }
         
-        # Ensure project has latest status
+        # Ensure project has latest status (progress only, no need to wait for the ack)
         update_project_partial_sync(
-            thread_projects_collection,
-            project_id,
+            sync_progress_projects,
+            project_oid,
             {
                 "processing_status": processing_status,
             }
@@ -698,7 +1002,8 @@ def run_extraction_thread(
         try:
             sitemap = Sitemap(start_url=url)
             if hasattr(sitemap, 'page_urls') and sitemap.page_urls:
-                sitemap_pages = list(sitemap.page_urls)
+                # Ordered de-duplication, the same page can appear in several sitemap files
+                sitemap_pages = list(dict.fromkeys(sitemap.page_urls))
                 processing_status["sitemap_status"] = "success"
                 processing_status["pages_found"] = len(sitemap_pages)
                 send_log(client_id, "success", f"Found {len(sitemap_pages)} pages in sitemap")
@@ -717,7 +1022,8 @@ def run_extraction_thread(
         send_log(client_id, "info", "Queuing sitemap pages for crawling...")
         queue_count = 0
         for page_url in sitemap_pages:
-            if page_url not in visited_urls:
+            if page_url not in queued_urls:
+                queued_urls.add(page_url)
                 url_queue.put((page_url, 0))  # All sitemap pages start at depth 0
                 queue_count += 1
         
@@ -726,47 +1032,92 @@ def run_extraction_thread(
         # Step 4: Process URLs recursively
         send_log(client_id, "info", f"Starting recursive crawling from {url_queue.qsize()} initial URLs")
         
-        # Process URLs from queue with depth tracking
-        while not url_queue.empty():
+        # Pending keyword checks, mapped to the (url, depth) they belong to
+        pending_checks = {}
+        # URLs taken off the queue whose pages have not been processed yet; they only
+        # count as visited once processed, so cancelled checks don't inflate the totals
+        in_flight_urls = set()
+        
+        def next_page():
+            """Take the next unvisited same-domain URL off the queue"""
+            while not url_queue.empty():
+                current_url, depth = url_queue.get()
+                
+                # Skip if already visited or waiting to be processed
+                if current_url in visited_urls or current_url in in_flight_urls:
+                    continue
+                    
+                # Skip if from a different domain
+                url_domain = urlparse(current_url).netloc
+                if url_domain != base_domain:
+                    continue
+                
+                # Mark as in flight to avoid duplicates
+                in_flight_urls.add(current_url)
+                return current_url, depth
+            return None
+        
+        def cancel_pending_checks():
+            """Drop keyword checks that will no longer be used"""
+            for future in pending_checks:
+                future.cancel()
+            pending_checks.clear()
+            in_flight_urls.clear()
+        
+        # Process URLs from queue with depth tracking. When keywords are given, the
+        # keyword checks run ahead on the main event loop while this thread scrapes
+        # pages whose checks have finished.
+        while True:
             # Update extraction stats periodically
-            extraction_stats[client_id]["pages_attempted"] = pages_checked
-            extraction_stats[client_id]["pages_successful"] = len(scraped_pages)
-            extraction_stats[client_id]["last_updated"] = datetime.datetime.utcnow().isoformat()
+            extraction_registry.update_stats(
+                client_id,
+                pages_attempted=pages_checked,
+                pages_successful=len(scraped_pages),
+                last_updated=datetime.datetime.utcnow().isoformat()
+            )
             
             # Check for interruption before processing each URL
             if should_interrupt(client_id):
+                cancel_pending_checks()
                 send_log(client_id, "warning", "Extraction process interrupted by user")
                 processing_status["extraction_status"] = STATUS_INTERRUPTED
                 processing_status["end_time"] = datetime.datetime.utcnow().isoformat()
                 processing_status["errors"].append("Extraction was interrupted by user request")
                 
-                # Update project with interrupted status
-                update_project_partial_sync(
-                    thread_projects_collection,
-                    project_id,
-                    {
-                        "processing_status.extraction_status": STATUS_INTERRUPTED,
-                        "processing_status.end_time": processing_status["end_time"],
-                        "processing_status.errors": processing_status["errors"]
-                    }
-                )
-                
                 # Send final status message before breaking the loop
                 send_log(client_id, "info", f"Final status: Interrupted after processing {pages_checked} pages")
                 break
             
-            current_url, depth = url_queue.get()
-            
-            # Skip if already visited
-            if current_url in visited_urls:
-                continue
+            if keyword_pattern:
+                # Keep the keyword-check stage topped up, bounded so it can't run far ahead
+                while len(pending_checks) < KEYWORD_PIPELINE_SIZE:
+                    page = next_page()
+                    if page is None:
+                        break
+                    send_log(client_id, "detail", f"Checking page for keywords: {page[0]}")
+                    future = asyncio.run_coroutine_threadsafe(
+                        check_page_for_keywords(page[0], keyword_lookup, keyword_pattern, include_meta),
+                        main_loop
+                    )
+                    pending_checks[future] = page
                 
-            # Skip if from a different domain
-            url_domain = urlparse(current_url).netloc
-            if url_domain != base_domain:
-                continue
+                if not pending_checks:
+                    break
+                
+                # Handle the next page whose keyword check has finished
+                done, _ = concurrent.futures.wait(pending_checks, return_when=concurrent.futures.FIRST_COMPLETED)
+                future = next(iter(done))
+                current_url, depth = pending_checks.pop(future)
+                keyword_result = future.result()
+            else:
+                page = next_page()
+                if page is None:
+                    break
+                current_url, depth = page
+                keyword_result = None
             
-            # Mark as visited to avoid duplicates
+            # The page is being processed now, so it counts as visited
+            in_flight_urls.discard(current_url)
             visited_urls.add(current_url)
             pages_checked += 1
             
@@ -774,19 +1125,14 @@ def run_extraction_thread(
             send_log(client_id, "info", f"Crawling page {pages_checked} at depth {depth}: {current_url}")
             
             try:
-                # Check for keywords if specified
+                # Use the keyword check results if keywords were specified
                 should_store = True
-                if search_keywords and len(search_keywords) > 0:
-                    send_log(client_id, "detail", f"Checking page for keywords: {current_url}")
-                    contains_keywords, matches, meta_info, contexts = check_page_for_keywords(
-                        current_url, 
-                        search_keywords, 
-                        include_meta
-                    )
+                if keyword_result is not None:
+                    contains_keywords, matches, meta_info, contexts = keyword_result
                     
                     if contains_keywords:
                         keyword_matched_urls.add(current_url)
-                        keyword_matches[current_url] = matches
+                        keyword_matches.append({"url": current_url, "keywords": matches})
                         keyword_contexts[current_url] = contexts
                         meta_info_extracted[current_url] = meta_info
                         pages_with_keywords += 1
@@ -815,7 +1161,8 @@ def run_extraction_thread(
                         new_link_count = 0
                         
                         for link in new_links:
-                            if link not in visited_urls:
+                            if link not in queued_urls:
+                                queued_urls.add(link)
                                 url_queue.put((link, depth + 1))
                                 new_link_count += 1
                         
@@ -834,10 +1181,12 @@ def run_extraction_thread(
                     if current_url in meta_info_extracted and meta_info_extracted[current_url]:
                         scraped_data["meta_info"] = meta_info_extracted[current_url]
                     
-                    # Store scraped data in MongoDB
-                    store_in_mongodb(scraped_data)
+                    # Buffer scraped data and write it to MongoDB in batches
+                    store_buffer.append(scraped_data)
+                    if len(store_buffer) >= STORE_BATCH_SIZE or time.time() - last_flush > STORE_FLUSH_INTERVAL:
+                        flush_store_buffer()
                     
-                    send_log(client_id, "success", f"Successfully stored page content for {current_url}")
+                    send_log(client_id, "success", f"Successfully extracted page content for {current_url}")
                     
                     # Log content stats
                     text_count = len(scraped_data.get('content', {}).get('text_content', []))
@@ -848,49 +1197,45 @@ def run_extraction_thread(
                 error_msg = f"Error processing {current_url}: {str(e)}"
                 send_log(client_id, "error", error_msg)
                 print(f"Processing exception: {error_msg}")
-                print(traceback.format_exc())
+                if DEBUG_EXTRACT:
+                    logger.exception(f"Processing exception: {error_msg}")
                 processing_status["errors"].append(error_msg)
             
-            # Update processing status after each page
+            # Update processing status after each page; progress is streamed over
+            # the WebSocket and written to MongoDB once at the end
             processing_status["pages_found"] = len(visited_urls)
             processing_status["pages_scraped"] = len(scraped_pages)
             
-            # Update the project in MongoDB after each page to ensure progress is saved
-            update_project_partial_sync(
-                thread_projects_collection,
-                project_id,
-                {
-                    "processing_status.pages_found": len(visited_urls),
-                    "processing_status.pages_scraped": len(scraped_pages),
-                    "processing_status.last_updated": datetime.datetime.utcnow().isoformat()
-                }
-            )
-            
-            # Update extracted links in database periodically
-            if pages_checked % 5 == 0 and all_extracted_links:
-                update_project_partial_sync(
-                    thread_projects_collection,
-                    project_id,
-                    {
-                        "processing_status.extracted_links": all_extracted_links
-                    }
-                )
-            
             # Check for interruption after each page
             if should_interrupt(client_id):
                 send_log(client_id, "warning", f"Crawling interrupted after processing {pages_checked} pages")
-                handle_interruption(client_id, loop, project_id, processing_status)
+                cancel_pending_checks()
+                flush_store_buffer()
+                # This is the only write of the crawl results, so hand all of them over
+                processing_status["keyword_matches"] = keyword_matches
+                processing_status["pages_with_keywords"] = pages_with_keywords
+                # The final write is awaited on the main loop with the shared Motor client
+                asyncio.run_coroutine_threadsafe(
+                    handle_interruption(client_id, project_id, processing_status, scraped_pages, visited_urls),
+                    main_loop
+                ).result()
                 return
         
-        # Final update to project with complete status
+        # Write any pages still waiting in the buffer
+        flush_store_buffer()
+        
+        # Final update to project with complete status, written in a single update
         processing_status["pages_scraped"] = len(scraped_pages)
         processing_status["pages_found"] = len(visited_urls)
-        processing_status["extraction_status"] = STATUS_COMPLETED
-        processing_status["end_time"] = datetime.datetime.utcnow().isoformat()
+        processing_status["keyword_matches"] = keyword_matches
+        processing_status["pages_with_keywords"] = pages_with_keywords
+        if processing_status["extraction_status"] != STATUS_INTERRUPTED:
+            processing_status["extraction_status"] = STATUS_COMPLETED
+            processing_status["end_time"] = datetime.datetime.utcnow().isoformat()
         
         update_project_partial_sync(
-            thread_projects_collection,
-            project_id,
+            sync_projects,
+            project_oid,
             {
                 "site_data.scraped_pages": scraped_pages,
                 "site_data.sitemap_pages": list(visited_urls),
@@ -899,26 +1244,23 @@ def run_extraction_thread(
         )
         
         # Update active extractions status
-        if client_id in active_extractions:
-            active_extractions[client_id]["status"] = STATUS_COMPLETED
-            active_extractions[client_id]["last_updated"] = datetime.datetime.utcnow()
+        extraction_registry.update(client_id, status=processing_status["extraction_status"])
         
         send_log(client_id, "success", f"Extraction completed successfully. Results saved to database.")
         send_log(client_id, "success", f"Final results: {len(scraped_pages)} pages scraped, {len(visited_urls)} pages found")
         
         # Notify client of completion
-        if client_id in message_queues:
-            message_queues[client_id].put({
-                "type": "completion",
-                "timestamp": datetime.datetime.utcnow().isoformat(),
-                "message": json.dumps({
-                    "project_id": project_id,
-                    "processing_status": {
-                        "pages_found": processing_status["pages_found"],
-                        "pages_scraped": processing_status["pages_scraped"]
-                    }
-                })
-            })
+        enqueue_message(client_id, {
+            "type": "completion",
+            "timestamp": message_timestamp(),
+            "message": {
+                "project_id": project_id,
+                "processing_status": {
+                    "pages_found": processing_status["pages_found"],
+                    "pages_scraped": processing_status["pages_scraped"]
+                }
+            }
+        })
     
     except Exception as e:
         error_msg = f"Unexpected error in extraction thread: {str(e)}"
@@ -927,9 +1269,7 @@ def run_extraction_thread(
         send_log(client_id, "error", error_msg)
         
         # Set error status
-        if client_id in active_extractions:
-            active_extractions[client_id]["status"] = STATUS_ERROR
-            active_extractions[client_id]["last_updated"] = datetime.datetime.utcnow()
+        extraction_registry.update(client_id, status=STATUS_ERROR)
         
         # Update project with error status
         try:
@@ -937,71 +1277,67 @@ def run_extraction_thread(
             processing_status["end_time"] = datetime.datetime.utcnow().isoformat()
             processing_status["errors"].append(error_msg)
             update_project_partial_sync(
-                thread_projects_collection,
-                project_id, 
+                sync_projects,
+                project_oid,
                 {"processing_status": processing_status}
             )
         except Exception as e:
             print(f"Failed to update project with error status: {str(e)}")
     finally:
-        # Make sure to close resources
-        thread_client.close()
-        loop.close()
+        # Make sure buffered pages are not lost on errors
+        flush_store_buffer()
+        
         print(f"Extraction thread for client {client_id} has completed")
         send_log(client_id, "info", "Background extraction process has ended")
         
         # Update extraction stats one final time - ensure end_time is stored as datetime, not string
-        if client_id in extraction_stats:
-            extraction_stats[client_id]["end_time"] = datetime.datetime.utcnow()
-            extraction_stats[client_id]["pages_attempted"] = pages_checked
-            extraction_stats[client_id]["pages_successful"] = len(scraped_pages)
+        extraction_registry.update_stats(
+            client_id,
+            end_time=datetime.datetime.utcnow(),
+            pages_attempted=pages_checked,
+            pages_successful=len(scraped_pages)
+        )
 
 def should_interrupt(client_id):
     """Check if an interruption has been requested for this client"""
-    if client_id not in active_extractions:
-        return False
-    return active_extractions[client_id].get("interrupt_requested", False)
+    _, interrupt_requested = extraction_registry.get_snapshot(client_id)
+    return interrupt_requested
 
-def handle_interruption(client_id, loop, project_id, processing_status):
-    """Handle the interruption process"""
-    if client_id not in active_extractions:
+async def handle_interruption(client_id, project_id, processing_status, scraped_pages, visited_urls):
+    """
+    Handle the interruption process and save the crawl results collected so far.
+    Runs on the main event loop.
+    """
+    # One timestamp for every field set by the interruption
+    now = datetime.datetime.utcnow()
+    now_iso = now.isoformat()
+    
+    # Set status to interrupted
+    if not extraction_registry.update(client_id, status=STATUS_INTERRUPTED, last_updated=now):
         return
     
     try:
-        # Set status to interrupted
-        active_extractions[client_id]["status"] = STATUS_INTERRUPTED
-        active_extractions[client_id]["last_updated"] = datetime.datetime.utcnow()
-        
         # Update processing status
         processing_status["extraction_status"] = STATUS_INTERRUPTED
-        processing_status["end_time"] = datetime.datetime.utcnow().isoformat()
-        
-        # Get MongoDB client
-        thread_client = AsyncIOMotorClient("mongodb://localhost:27017")
-        thread_db = thread_client.hackathon
-        thread_projects_collection = thread_db.projects
-        
-        # Ensure all extracted data is saved before terminating
-        # Get current extraction data
-        project_data = thread_projects_collection.find_one({"_id": ObjectId(project_id)})
+        processing_status["end_time"] = now_iso
+        processing_status["interrupted_at"] = now_iso
+        processing_status["pages_scraped"] = len(scraped_pages)
+        processing_status["pages_found"] = len(visited_urls)
+        processing_status.setdefault("keyword_matches", [])
+        processing_status.setdefault("pages_with_keywords", 0)
         
-        # Prepare final update with all collected data
+        # Prepare final update with all collected data; the status fields are set on
+        # processing_status itself since $set can't take a field and its subfields together
         final_update = {
             "processing_status": processing_status,
-            "site_data.scraped_pages": processing_status.get("scraped_pages", []),
-            "site_data.sitemap_pages": list(processing_status.get("visited_urls", [])),
-            "processing_status.extraction_status": STATUS_INTERRUPTED,
-            "processing_status.end_time": processing_status["end_time"],
-            "processing_status.keywords_matched": processing_status.get("keywords_matched", {}),
-            "processing_status.interrupted_at": datetime.datetime.utcnow().isoformat(),
-            "processing_status.pages_with_keywords": processing_status.get("pages_with_keywords", 0),
+            "site_data.scraped_pages": list(scraped_pages),
+            "site_data.sitemap_pages": list(visited_urls),
         }
         
         # Update the project with interrupted status and all collected data
-        update_project_partial_sync(
-            thread_projects_collection,
-            project_id,
-            final_update
+        await projects_collection.update_one(
+            {"_id": _oid(project_id)},
+            {"$set": final_update}
         )
         
         # Send log message
@@ -1009,55 +1345,52 @@ def handle_interruption(client_id, loop, project_id, processing_status):
         send_log(client_id, "info", f"Data extraction completed for {processing_status.get('pages_scraped', 0)} pages before interruption")
         send_log(client_id, "info", "All extracted data has been saved and can be viewed in project details")
         
-        # Clean up
-        thread_client.close()
-        
         # Send completion message
-        if client_id in message_queues:
-            message_queues[client_id].put({
-                "type": "completion",
-                "timestamp": datetime.datetime.utcnow().isoformat(),
-                "message": json.dumps({
-                    "project_id": project_id,
-                    "processing_status": {
-                        "pages_found": processing_status.get("pages_found", 0),
-                        "pages_scraped": processing_status.get("pages_scraped", 0),
-                        "extraction_status": STATUS_INTERRUPTED
-                    }
-                })
-            })
+        enqueue_message(client_id, {
+            "type": "completion",
+            "timestamp": message_timestamp(),
+            "message": {
+                "project_id": project_id,
+                "processing_status": {
+                    "pages_found": processing_status.get("pages_found", 0),
+                    "pages_scraped": processing_status.get("pages_scraped", 0),
+                    "extraction_status": STATUS_INTERRUPTED
+                }
+            }
+        })
     except Exception as e:
         print(f"Error handling interruption: {str(e)}")
         print(traceback.format_exc())
 
 def interrupt_extraction(client_id):
     """Send an interrupt signal to an extraction process"""
-    if client_id not in active_extractions:
+    if not extraction_registry.update(client_id, interrupt_requested=True):
         return False
     
-    active_extractions[client_id]["interrupt_requested"] = True
-    active_extractions[client_id]["last_updated"] = datetime.datetime.utcnow()
     print(f"Interrupt requested for client {client_id}")
     return True
 
 def get_extraction_status(client_id):
-    """Get the current status of an extraction process with enhanced information"""
-    if client_id not in active_extractions:
-        return {
+    """
+    Get the current status of an extraction process with enhanced information.
+    Returns a read-only view over the snapshot taken from the registry.
+    """
+    # Copies taken under the registry lock, safe to extend below
+    status, stats = extraction_registry.get_with_stats(client_id)
+    if status is None:
+        return MappingProxyType({
             "status": "unknown",
             "message": "No extraction found with this ID"
-        }
-    
-    status = active_extractions[client_id].copy()
+        })
     
     # Add additional stats if available
-    if client_id in extraction_stats:
-        status["stats"] = extraction_stats[client_id]
+    if stats is not None:
+        status["stats"] = stats
         
         # Calculate runtime
-        if "start_time" in extraction_stats[client_id]:
-            start_time = extraction_stats[client_id]["start_time"]
-            end_time = extraction_stats[client_id].get("end_time")
+        if "start_time" in stats:
+            start_time = stats["start_time"]
+            end_time = stats.get("end_time")
             
             try:
                 # Convert end_time to datetime if it's a string
@@ -1076,17 +1409,20 @@ def get_extraction_status(client_id):
                 status["stats"]["runtime_seconds"] = 0
                 status["stats"]["runtime_formatted"] = "00:00:00"
     
-    return status
+    return MappingProxyType(status)
+
+@functools.lru_cache(maxsize=1024)
+def _oid(project_id):
+    """Convert a project id to an ObjectId; accepts an ObjectId as is. Cached per project id."""
+    return project_id if isinstance(project_id, ObjectId) else ObjectId(project_id)
 
 def update_project_partial_sync(collection, project_id, update_data):
     """Update a project with partial data in a synchronous way"""
     try:
-        # Create a sync client to avoid asyncio issues in threads
-        client = MongoClient("mongodb://localhost:27017")
-        db = client.hackathon
+        project_oid = _oid(project_id)
         
-        # Get the collection
-        coll = db[collection.name]
+        # Resolve the collection on the shared sync client, keeping the caller's write concern
+        coll = sync_client.hackathon.get_collection(collection.name, write_concern=collection.write_concern)
         
         # Build the update document
         update_doc = {}
@@ -1099,10 +1435,7 @@ def update_project_partial_sync(collection, project_id, update_data):
                 update_doc[key] = value
         
         # Update the document
-        coll.update_one({"_id": ObjectId(project_id)}, {"$set": update_doc})
-        
-        # Close the client
-        client.close()
+        coll.update_one({"_id": project_oid}, {"$set": update_doc})
         
     except Exception as e:
         print(f"Error updating project: {str(e)}")
@@ -1111,22 +1444,17 @@ def update_project_partial_sync(collection, project_id, update_data):
 def update_project_array_sync(collection, project_id, array_field, items):
     """Update a project array field by adding items in a synchronous way"""
     try:
-        # Create a sync client to avoid asyncio issues in threads
-        client = MongoClient("mongodb://localhost:27017")
-        db = client.hackathon
+        project_oid = _oid(project_id)
         
-        # Get the collection
-        coll = db[collection.name]
+        # Resolve the collection on the shared sync client
+        coll = sync_client.hackathon[collection.name]
         
         # Update the document by pushing to the array
         coll.update_one(
-            {"_id": ObjectId(project_id)}, 
+            {"_id": project_oid}, 
             {"$push": {array_field: {"$each": items}}}
         )
         
-        # Close the client
-        client.close()
-        
     except Exception as e:
         print(f"Error updating project array: {str(e)}")
         print(traceback.format_exc())
@@ -1,7 +1,8 @@
 import requests
 import time
 from bs4 import BeautifulSoup
-from pymongo import MongoClient
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import BulkWriteError
 from bson import ObjectId
 import re
 from urllib.parse import urljoin
@@ -15,6 +16,9 @@ import hashlib  # Add this import for content_hash
 mongo_client = MongoClient("mongodb://localhost:27017")
 mongo_db = mongo_client.hackathon
 
+# Matches Open Graph meta properties (og:title, og:image, ...)
+OG_PROPERTY_RE = re.compile(r'^og:')
+
 def scrape_website(url, extract_product_info=False, search_keywords=None):
     """
     Scrape a website and extract its content, including links for recursive scraping.
@@ -54,7 +58,7 @@ def scrape_website(url, extract_product_info=False, search_keywords=None):
         }
         
         # Parse the HTML
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = BeautifulSoup(response.content, 'lxml')
         
         # Extract base URL for resolving relative links
         base_url = url
@@ -190,7 +194,7 @@ def extract_meta_info(soup, url):
     
     # Extract Open Graph data
     og_data = {}
-    for tag in soup.find_all('meta', property=lambda x: x and x.startswith('og:')):
+    for tag in soup.find_all('meta', attrs={'property': OG_PROPERTY_RE}):
         if tag.get('content'):
             og_data[tag['property'][3:]] = tag['content']
     
@@ -450,3 +454,24 @@ def store_in_mongodb(scraped_data):
         print(f"MongoDB error: {str(e)}")
     
     return scraped_data.get("_id", None)
+
+def store_many_in_mongodb(scraped_pages):
+    """Store a batch of scraped pages in MongoDB with a single bulk write"""
+    if not scraped_pages:
+        return 0
+    
+    # Same upsert-by-URL as store_in_mongodb, unordered so one bad page doesn't abort the batch
+    operations = [
+        UpdateOne({"url": page["url"]}, {"$set": page}, upsert=True)
+        for page in scraped_pages
+    ]
+    try:
+        mongo_db.sites.bulk_write(operations, ordered=False)
+        return len(operations)
+    except BulkWriteError as e:
+        write_errors = e.details.get("writeErrors", [])
+        print(f"MongoDB bulk write error: {len(write_errors)} of {len(operations)} pages failed")
+        return len(operations) - len(write_errors)
+    except Exception as e:
+        print(f"MongoDB error: {str(e)}")
+        return 0
@@ -0,0 +1,122 @@
+import os
+import sys
+import unittest
+
+# Backend modules import each other relative to the backend directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.project_manager import (
+    build_keyword_lookup,
+    build_keyword_pattern,
+    scan_page_for_keywords,
+    truncate_body,
+)
+
+
+def scan(html, keywords, include_meta=True):
+    return scan_page_for_keywords(
+        html,
+        build_keyword_lookup(keywords),
+        build_keyword_pattern(keywords),
+        include_meta
+    )
+
+
+class BuildKeywordPatternTests(unittest.TestCase):
+    def test_empty_and_whitespace_keywords_are_dropped(self):
+        keywords = ["foo", "", "   "]
+        self.assertEqual(build_keyword_lookup(keywords), {"foo": "foo"})
+        self.assertEqual(build_keyword_pattern(keywords).pattern, "foo")
+
+    def test_no_usable_keywords_gives_no_pattern(self):
+        self.assertIsNone(build_keyword_pattern([]))
+        self.assertIsNone(build_keyword_pattern(["", " "]))
+
+
+class ScanPageForKeywordsTests(unittest.TestCase):
+    def test_match_is_case_insensitive_and_keeps_user_spelling(self):
+        found, keywords, _, contexts = scan("<p>We love PYTHON here</p>", ["Python"])
+        self.assertTrue(found)
+        self.assertEqual(keywords, ["Python"])
+        self.assertIn("PYTHON", contexts["Python"])
+
+    def test_no_match(self):
+        found, keywords, _, _ = scan("<p>Nothing to see</p>", ["python"])
+        self.assertFalse(found)
+        self.assertEqual(keywords, [])
+
+    def test_overlapping_keywords_are_all_found(self):
+        _, keywords, _, _ = scan("<p>new york city</p>", ["new york", "york city"])
+        self.assertCountEqual(keywords, ["new york", "york city"])
+
+        _, keywords, _, _ = scan("<p>abcd</p>", ["abc", "bcd"])
+        self.assertCountEqual(keywords, ["abc", "bcd"])
+
+    def test_keyword_inside_a_longer_keyword_is_found(self):
+        _, keywords, _, _ = scan("<p>new york</p>", ["new", "new york"])
+        self.assertCountEqual(keywords, ["new", "new york"])
+
+    def test_text_outside_common_tags_is_scanned(self):
+        found, keywords, _, _ = scan("<html><body><section>Python rocks</section></body></html>", ["python"])
+        self.assertTrue(found)
+        self.assertEqual(keywords, ["python"])
+
+    def test_empty_keyword_does_not_hang(self):
+        found, keywords, _, _ = scan("<p>foo bar</p>", ["foo", ""])
+        self.assertTrue(found)
+        self.assertEqual(keywords, ["foo"])
+
+    def test_meta_matches_report_their_source(self):
+        html = (
+            "<html><head><title>Red Shoes</title>"
+            "<meta name='description' content='Best boots in town'>"
+            "<meta property='og:title' content='Sandals sale'>"
+            "</head><body><p>Welcome</p></body></html>"
+        )
+        found, keywords, meta_info, contexts = scan(html, ["shoes", "boots", "sandals"])
+        self.assertTrue(found)
+        self.assertCountEqual(keywords, ["shoes", "boots", "sandals"])
+        self.assertEqual(meta_info["title"], "Red Shoes")
+        self.assertEqual(contexts["boots"], "Meta description: Best boots in town")
+        self.assertEqual(contexts["sandals"], "Open Graph: Sandals sale")
+
+    def test_meta_is_skipped_when_not_requested(self):
+        html = "<html><head><meta name='description' content='boots'></head><body><p>Welcome</p></body></html>"
+        found, keywords, meta_info, _ = scan(html, ["boots"], include_meta=False)
+        self.assertFalse(found)
+        self.assertEqual(keywords, [])
+        self.assertEqual(meta_info, {})
+
+    def test_separator_is_never_reported_as_a_match(self):
+        found, _, _, _ = scan("<html><head><title>Home</title></head><body><p>Welcome</p></body></html>", ["meta"])
+        self.assertFalse(found)
+
+    def test_image_alt_text_is_scanned(self):
+        found, keywords, _, contexts = scan("<div><img src='x.png' alt='A python logo'></div>", ["python"])
+        self.assertTrue(found)
+        self.assertEqual(keywords, ["python"])
+        self.assertEqual(contexts["python"], "Image alt: A python logo")
+
+
+class TruncateBodyTests(unittest.TestCase):
+    def test_short_body_is_unchanged(self):
+        self.assertEqual(truncate_body(b"<p>caf\xc3\xa9</p>", 100), b"<p>caf\xc3\xa9</p>")
+
+    def test_cut_never_splits_a_character(self):
+        body = "<p>café</p><p>€€</p>".encode("utf-8")
+        for limit in range(len(body) + 1):
+            truncated = truncate_body(body, limit)
+            self.assertLessEqual(len(truncated), limit)
+            truncated.decode("utf-8")
+
+    def test_non_ascii_keyword_found_in_truncated_body(self):
+        body = "<html><body><p>Un café ici</p><p>€</p></body></html>".encode("utf-8")
+        # Cut the body inside the euro sign
+        limit = body.index("€".encode("utf-8")) + 2
+        found, keywords, _, _ = scan(truncate_body(body, limit), ["café"])
+        self.assertTrue(found)
+        self.assertEqual(keywords, ["café"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -42,6 +42,15 @@ class ConnectionManager:
                 # Don't disconnect here, as it might be a temporary network issue
                 # The client will try to reconnect if needed
 
+    async def send_personal_serialized_json(self, payload: bytes, client_id: str):
+        """Send an already JSON-encoded message to a specific client as a text frame"""
+        if client_id in self.active_connections:
+            try:
+                await self.active_connections[client_id].send_text(payload.decode("utf-8"))
+            except Exception as e:
+                print(f"Error sending JSON message to client {client_id}: {e}")
+                print(traceback.format_exc())
+
     async def send_status_update(self, client_id: str, status: str, message: str):
         """Send a status update message to a specific client"""
         if client_id in self.active_connections:
@@ -0,0 +1,182 @@
+"""Chrome driver setup and performance log processing shared by app.py and main.py"""
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import TimeoutException, WebDriverException
+import orjson
+import asyncio
+import logging
+import queue
+
+logger = logging.getLogger(__name__)
+
+# Performance log methods used by process_network_data
+REQUEST_WILL_BE_SENT = 'Network.requestWillBeSent'
+RESPONSE_RECEIVED = 'Network.responseReceived'
+
+def setup_chrome_driver():
+    chrome_options = Options()
+    chrome_options.add_argument('--headless')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    # Only Network events are read from the performance log; leave out Page events and tracing
+    chrome_options.add_experimental_option('perfLoggingPrefs', {
+        'enableNetwork': True,
+        'enablePage': False,
+        'traceCategories': ''
+    })
+    # driver.get() returns once Chrome fires the load event, so no readyState polling is needed
+    return webdriver.Chrome(options=chrome_options)
+
+def process_network_data(logs, start_time, end_time):
+    """Build the request entries from the performance log; returns (entries, total_size, request_count)"""
+    entries = []
+    request_data = {}
+    total_size = 0
+    
+    # Local bindings for the hot loop
+    loads = orjson.loads
+    append = entries.append
+    request_will_be_sent = REQUEST_WILL_BE_SENT
+    response_received = RESPONSE_RECEIVED
+    request_will_be_sent_quoted = f'"{REQUEST_WILL_BE_SENT}"'
+    response_received_quoted = f'"{RESPONSE_RECEIVED}"'
+    
+    for log in logs:
+        if 'message' not in log:
+            continue
+        
+        # Most entries are other events; skip them before paying for the JSON parse. The
+        # quoted names don't match the ...ExtraInfo events, which carry the raw headers
+        raw_message = log['message']
+        if request_will_be_sent_quoted not in raw_message and response_received_quoted not in raw_message:
+            continue
+            
+        try:
+            message = loads(raw_message)['message']
+            method = message['method']
+            
+            if method == request_will_be_sent:
+                req = message['params']
+                request = req['request']
+                request_data[req['requestId']] = {
+                    'url': request['url'],
+                    'method': request['method'],
+                    'headers': request['headers'],
+                    'timestamp': req['timestamp'],
+                    'post_data': request.get('postData'),
+                }
+                
+            elif method == response_received:
+                resp = message['params']
+                request = request_data.get(resp['requestId'])
+                if request is not None:
+                    response = resp['response']
+                    timing_get = response.get('timing', {}).get
+                    content_size = response.get('encodedDataLength', 0)
+                    total_size += content_size
+                    
+                    headers_end = timing_get('receiveHeadersEnd', 0)
+                    connect_time = max(0, timing_get('connectEnd', 0) - timing_get('connectStart', 0))
+                    wait_time = max(0, headers_end - timing_get('sendEnd', 0))
+                    receive_time = max(0, timing_get('responseEnd', 0) - headers_end)
+                    total_time = connect_time + wait_time + receive_time
+                    
+                    append({
+                        'url': request['url'],
+                        'method': request['method'],
+                        'status': int(response.get('status', 0)),
+                        'content_type': response.get('mimeType', ''),
+                        'timing': {
+                            'connect': round(connect_time, 2),
+                            'wait': round(wait_time, 2),
+                            'receive': round(receive_time, 2),
+                            'total': round(total_time, 2)
+                        },
+                        'request': {
+                            'headers': request['headers'],
+                            'post_data': request['post_data']
+                        },
+                        'response': {
+                            'headers': response.get('headers', {}),
+                            'content': response.get('content', {}),
+                            'cookies': response.get('cookies', [])
+                        },
+                        'content_size': content_size
+                    })
+        except (orjson.JSONDecodeError, KeyError) as e:
+            logger.error(f"Error processing log entry: {str(e)}")
+            continue
+    
+    return entries, total_size, len(entries)
+
+async def start_driver_pool(driver_pool, executor, size):
+    """Start size warm drivers on the executor and put them in driver_pool"""
+    loop = asyncio.get_running_loop()
+    drivers = await asyncio.gather(
+        *[loop.run_in_executor(executor, setup_chrome_driver) for _ in range(size)],
+        return_exceptions=True
+    )
+    for driver in drivers:
+        if isinstance(driver, Exception):
+            logger.error(f"Failed to start Chrome driver: {str(driver)}")
+        else:
+            driver_pool.put(driver)
+
+def stop_driver_pool(driver_pool, executor):
+    """Stop the executor and quit every pooled driver"""
+    # Let running page loads finish first, so the drivers they hand back are quit too
+    executor.shutdown(wait=True)
+    while not driver_pool.empty():
+        discard_driver(driver_pool.get_nowait())
+
+def checkout_driver(driver_pool):
+    """
+    Take a warm driver from the pool, or start a new one if none is free, and open
+    a fresh tab for the next page so nothing from an earlier page carries over.
+    """
+    try:
+        driver = driver_pool.get_nowait()
+    except queue.Empty:
+        driver = setup_chrome_driver()
+    
+    try:
+        driver.switch_to.new_window('tab')
+    except TimeoutException:
+        # The browser is alive but slow; keep it for later rather than restarting it
+        release_driver(driver_pool, driver)
+        raise
+    except WebDriverException:
+        # The pooled browser has gone away, replace it
+        discard_driver(driver)
+        driver = setup_chrome_driver()
+        try:
+            driver.switch_to.new_window('tab')
+        except WebDriverException:
+            # Don't leak the replacement's Chrome process
+            discard_driver(driver)
+            raise
+    
+    # Discard performance logs left over from earlier use of this driver
+    driver.get_log('performance')
+    return driver
+
+def release_driver(driver_pool, driver):
+    """Close the page's tab, clear cookies and cache, and return the driver to the pool"""
+    try:
+        if len(driver.window_handles) > 1:
+            driver.close()
+        driver.switch_to.window(driver.window_handles[0])
+        # Cached responses would hide real transfer sizes and timings on the next page
+        driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+        driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+        driver_pool.put(driver)
+    except Exception:
+        discard_driver(driver)
+
+def discard_driver(driver):
+    """Quit a driver that shouldn't be reused"""
+    try:
+        driver.quit()
+    except Exception:
+        pass
@@ -2,16 +2,19 @@ from fastapi import FastAPI, HTTPException, Request
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.common.exceptions import WebDriverException
-import json
+from selenium.common.exceptions import TimeoutException, WebDriverException
 import time
 import logging
+import asyncio
+import queue
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from pydantic import BaseModel, HttpUrl
 from typing import List
+from _common import (
+    process_network_data, start_driver_pool, stop_driver_pool,
+    checkout_driver, release_driver, discard_driver
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -31,77 +34,75 @@ static_dir = Path("static")
 static_dir.mkdir(exist_ok=True)
 app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
 
+# Number of URLs analyzed at once, each with its own warm Chrome instance
+DRIVER_POOL_SIZE = 4
+executor = ThreadPoolExecutor(max_workers=DRIVER_POOL_SIZE)
+# Warm drivers waiting to be checked out by _analyze_one
+driver_pool = queue.Queue()
+
 class URLInput(BaseModel):
     urls: List[HttpUrl]
 
-def setup_chrome_driver():
-    chrome_options = Options()
-    chrome_options.add_argument('--headless')
-    chrome_options.add_argument('--no-sandbox')
-    chrome_options.add_argument('--disable-dev-shm-usage')
-    chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
-    return webdriver.Chrome(options=chrome_options)
+@app.on_event("startup")
+async def warm_up_drivers():
+    await start_driver_pool(driver_pool, executor, DRIVER_POOL_SIZE)
 
-def process_network_data(logs, start_time, end_time):
-    entries = []
-    request_data = {}
-    
-    for log in logs:
-        if 'message' not in log:
-            continue
-            
-        try:
-            message = json.loads(log['message'])['message']
-            
-            if message['method'] == 'Network.requestWillBeSent':
-                req = message['params']
-                request_data[req['requestId']] = {
-                    'url': req['request']['url'],
-                    'method': req['request']['method'],
-                    'headers': req['request']['headers'],
-                    'timestamp': req['timestamp'],
-                    'post_data': req['request'].get('postData'),
-                }
-                
-            elif message['method'] == 'Network.responseReceived':
-                resp = message['params']
-                if resp['requestId'] in request_data:
-                    request = request_data[resp['requestId']]
-                    response = resp['response']
-                    timing = response.get('timing', {})
-                    
-                    connect_time = max(0, timing.get('connectEnd', 0) - timing.get('connectStart', 0))
-                    wait_time = max(0, timing.get('receiveHeadersEnd', 0) - timing.get('sendEnd', 0))
-                    receive_time = max(0, timing.get('responseEnd', 0) - timing.get('receiveHeadersEnd', 0))
-                    total_time = connect_time + wait_time + receive_time
-                    
-                    entries.append({
-                        'url': request['url'],
-                        'method': request['method'],
-                        'status': int(response.get('status', 0)),
-                        'content_type': response.get('mimeType', ''),
-                        'timing': {
-                            'connect': round(connect_time, 2),
-                            'wait': round(wait_time, 2),
-                            'receive': round(receive_time, 2),
-                            'total': round(total_time, 2)
-                        },
-                        'request': {
-                            'headers': request['headers'],
-                            'post_data': request['post_data']
-                        },
-                        'response': {
-                            'headers': response.get('headers', {}),
-                            'content': response.get('content', {}),
-                            'cookies': response.get('cookies', [])
-                        },
-                        'content_size': response.get('encodedDataLength', 0)
-                    })
-        except (json.JSONDecodeError, KeyError) as e:
-            logger.error(f"Error processing log entry: {str(e)}")
-            continue
-            
-    return entries
+@app.on_event("shutdown")
+def shut_down_drivers():
+    stop_driver_pool(driver_pool, executor)
+
+def _analyze_one(url):
+    """Load one URL in a pooled driver and return its network analysis result"""
+    driver = None
+    try:
+        driver = checkout_driver(driver_pool)
+        
+        start_time = time.time() * 1000
+        driver.get(url)
+        end_time = time.time() * 1000
+        
+        logs = driver.get_log('performance')
+        entries, total_size, request_count = process_network_data(logs, start_time, end_time)
+        
+        return {
+            "url": url,
+            "status": "success",
+            "data": entries,
+            "page_metrics": {
+                "total_load_time": round(end_time - start_time, 2),
+                "request_count": request_count,
+                "total_size": total_size
+            }
+        }
+    except TimeoutException as e:
+        # Only the page was too slow; its tab is closed and the browser goes back to the pool
+        logger.error(f"Timed out loading {url}: {str(e)}")
+        return {
+            "url": url,
+            "status": "error",
+            "error": "Timed out loading the webpage"
+        }
+    except WebDriverException as e:
+        logger.error(f"Selenium error for {url}: {str(e)}")
+        # The driver may be broken, don't hand it to the next request
+        if driver:
+            discard_driver(driver)
+            driver = None
+        return {
+            "url": url,
+            "status": "error",
+            "error": "Failed to load the webpage"
+        }
+    except Exception as e:
+        logger.error(f"Unexpected error for {url}: {str(e)}")
+        return {
+            "url": url,
+            "status": "error",
+            "error": str(e)
+        }
+    finally:
+        if driver:
+            release_driver(driver_pool, driver)
 
 @app.get("/")
 async def root(request: Request):
@@ -109,54 +110,13 @@ async def root(request: Request):
 
 @app.post("/analyze")
 async def analyze_network(urls: URLInput):
-    results = []
-    for url in urls.urls:
-        driver = None
-        try:
-            driver = setup_chrome_driver()
-            start_time = time.time() * 1000
-            driver.get(str(url))
-            
-            WebDriverWait(driver, 10).until(
-                lambda d: d.execute_script("return document.readyState") == "complete"
-            )
-            end_time = time.time() * 1000
-            
-            logs = driver.get_log('performance')
-            entries = process_network_data(logs, start_time, end_time)
-            
-            results.append({
-                "url": str(url),
-                "status": "success",
-                "data": entries,
-                "page_metrics": {
-                    "total_load_time": round(end_time - start_time, 2),
-                    "request_count": len(entries),
-                    "total_size": sum(entry['content_size'] for entry in entries)
-                }
-            })
-        except WebDriverException as e:
-            logger.error(f"Selenium error for {url}: {str(e)}")
-            results.append({
-                "url": str(url),
-                "status": "error",
-                "error": "Failed to load the webpage"
-            })
-        except Exception as e:
-            logger.error(f"Unexpected error for {url}: {str(e)}")
-            results.append({
-                "url": str(url),
-                "status": "error",
-                "error": str(e)
-            })
-        finally:
-            if driver:
-                try:
-                    driver.quit()
-                except:
-                    pass
+    # Analyze all URLs concurrently on the driver pool without blocking the event loop
+    loop = asyncio.get_running_loop()
+    results = await asyncio.gather(
+        *[loop.run_in_executor(executor, _analyze_one, str(url)) for url in urls.urls]
+    )
     
-    return {"results": results}
+    return {"results": list(results)}
 
 if __name__ == "__main__":
     import uvicorn
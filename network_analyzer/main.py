@@ -2,15 +2,18 @@ from fastapi import FastAPI, HTTPException, Request
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.common.exceptions import WebDriverException
-import json
+from selenium.common.exceptions import TimeoutException, WebDriverException
 import time
 import logging
+import queue
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from pydantic import BaseModel, HttpUrl
+from _common import (
+    process_network_data, start_driver_pool, stop_driver_pool,
+    checkout_driver, release_driver, discard_driver
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -30,77 +33,45 @@ static_dir = Path("static")
 static_dir.mkdir(exist_ok=True)
 app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
 
+# Warm Chrome instances kept between requests, so a request doesn't pay for browser startup
+DRIVER_POOL_SIZE = 2
+executor = ThreadPoolExecutor(max_workers=DRIVER_POOL_SIZE)
+driver_pool = queue.Queue()
+
 class URLInput(BaseModel):
     url: HttpUrl
 
-def setup_chrome_driver():
-    chrome_options = Options()
-    chrome_options.add_argument('--headless')
-    chrome_options.add_argument('--no-sandbox')
-    chrome_options.add_argument('--disable-dev-shm-usage')
-    chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
-    return webdriver.Chrome(options=chrome_options)
+@app.on_event("startup")
+async def warm_up_drivers():
+    await start_driver_pool(driver_pool, executor, DRIVER_POOL_SIZE)
+
+@app.on_event("shutdown")
+def shut_down_drivers():
+    stop_driver_pool(driver_pool, executor)
 
-def process_network_data(logs, start_time, end_time):
-    entries = []
-    request_data = {}
+def _load_page(url):
+    """Load a URL in a pooled driver and return (entries, total_size, request_count, start_time, end_time)"""
+    driver = checkout_driver(driver_pool)
     
-    for log in logs:
-        if 'message' not in log:
-            continue
-            
-        try:
-            message = json.loads(log['message'])['message']
-            
-            if message['method'] == 'Network.requestWillBeSent':
-                req = message['params']
-                request_data[req['requestId']] = {
-                    'url': req['request']['url'],
-                    'method': req['request']['method'],
-                    'headers': req['request']['headers'],
-                    'timestamp': req['timestamp'],
-                    'post_data': req['request'].get('postData')
-                }
-                
-            elif message['method'] == 'Network.responseReceived':
-                resp = message['params']
-                if resp['requestId'] in request_data:
-                    request = request_data[resp['requestId']]
-                    response = resp['response']
-                    timing = response.get('timing', {})
-                    
-                    # Calculate timings
-                    connect_time = max(0, timing.get('connectEnd', 0) - timing.get('connectStart', 0))
-                    wait_time = max(0, timing.get('receiveHeadersEnd', 0) - timing.get('sendEnd', 0))
-                    receive_time = max(0, timing.get('responseEnd', 0) - timing.get('receiveHeadersEnd', 0))
-                    
-                    entries.append({
-                        'url': request['url'],
-                        'method': request['method'],
-                        'status': int(response.get('status', 0)),
-                        'content_type': response.get('mimeType', ''),
-                        'timing': {
-                            'connect': round(connect_time, 2),
-                            'wait': round(wait_time, 2),
-                            'receive': round(receive_time, 2),
-                            'total': round(connect_time + wait_time + receive_time, 2)
-                        },
-                        'request': {
-                            'headers': request['headers'],
-                            'post_data': request['post_data']
-                        },
-                        'response': {
-                            'headers': response.get('headers', {}),
-                            'content': response.get('content', {}),
-                            'cookies': response.get('cookies', [])
-                        },
-                        'content_size': response.get('encodedDataLength', 0)
-                    })
-        except (json.JSONDecodeError, KeyError) as e:
-            logger.error(f"Error processing log entry: {str(e)}")
-            continue
-            
-    return entries
+    try:
+        start_time = time.time() * 1000
+        driver.get(url)
+        end_time = time.time() * 1000
+        
+        logs = driver.get_log('performance')
+        entries, total_size, request_count = process_network_data(logs, start_time, end_time)
+        return entries, total_size, request_count, start_time, end_time
+    except TimeoutException:
+        # Only the page was too slow; its tab is closed and the browser goes back to the pool
+        raise
+    except WebDriverException:
+        # The driver may be broken, don't hand it to the next request
+        discard_driver(driver)
+        driver = None
+        raise
+    finally:
+        if driver:
+            release_driver(driver_pool, driver)
 
 @app.get("/")
 async def root(request: Request):
@@ -108,41 +79,28 @@ async def root(request: Request):
 
 @app.post("/analyze")
 async def analyze_network(url_input: URLInput):
-    driver = None
     try:
-        driver = setup_chrome_driver()
-        start_time = time.time() * 1000
-        driver.get(str(url_input.url))
-        
-        WebDriverWait(driver, 10).until(
-            lambda d: d.execute_script("return document.readyState") == "complete"
-        )
-        end_time = time.time() * 1000
-        
-        logs = driver.get_log('performance')
-        entries = process_network_data(logs, start_time, end_time)
+        loop = asyncio.get_running_loop()
+        entries, total_size, request_count, start_time, end_time = await loop.run_in_executor(executor, _load_page, str(url_input.url))
         
         return {
             "status": "success",
             "data": entries,
             "page_metrics": {
                 "total_load_time": round(end_time - start_time, 2),
-                "request_count": len(entries),
-                "total_size": sum(entry['content_size'] for entry in entries)
+                "request_count": request_count,
+                "total_size": total_size
             }
         }
+    except TimeoutException as e:
+        logger.error(f"Page load timed out: {str(e)}")
+        raise HTTPException(status_code=504, detail="Timed out loading the webpage")
     except WebDriverException as e:
         logger.error(f"Selenium error: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to load the webpage")
     except Exception as e:
         logger.error(f"Unexpected error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        if driver:
-            try:
-                driver.quit()
-            except:
-                pass
 
 if __name__ == "__main__":
     import uvicorn
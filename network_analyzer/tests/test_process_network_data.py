@@ -0,0 +1,141 @@
+import json
+import os
+import random
+import sys
+import unittest
+
+# The apps import _common relative to the network_analyzer directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _common import process_network_data
+
+TIMING_FIELDS = ['connectStart', 'connectEnd', 'sendEnd', 'receiveHeadersEnd', 'responseEnd']
+
+
+def reference_process_network_data(logs):
+    """The original per-entry loop built on json, kept to check the output is unchanged"""
+    entries = []
+    request_data = {}
+    for log in logs:
+        message = json.loads(log['message'])['message']
+        if message['method'] == 'Network.requestWillBeSent':
+            req = message['params']
+            request_data[req['requestId']] = {
+                'url': req['request']['url'],
+                'method': req['request']['method'],
+                'headers': req['request']['headers'],
+                'post_data': req['request'].get('postData'),
+            }
+        elif message['method'] == 'Network.responseReceived':
+            resp = message['params']
+            if resp['requestId'] in request_data:
+                request = request_data[resp['requestId']]
+                response = resp['response']
+                timing = response.get('timing', {})
+                connect_time = max(0, timing.get('connectEnd', 0) - timing.get('connectStart', 0))
+                wait_time = max(0, timing.get('receiveHeadersEnd', 0) - timing.get('sendEnd', 0))
+                receive_time = max(0, timing.get('responseEnd', 0) - timing.get('receiveHeadersEnd', 0))
+                total_time = connect_time + wait_time + receive_time
+                entries.append({
+                    'url': request['url'],
+                    'method': request['method'],
+                    'status': int(response.get('status', 0)),
+                    'content_type': response.get('mimeType', ''),
+                    'timing': {
+                        'connect': round(connect_time, 2),
+                        'wait': round(wait_time, 2),
+                        'receive': round(receive_time, 2),
+                        'total': round(total_time, 2)
+                    },
+                    'request': {
+                        'headers': request['headers'],
+                        'post_data': request['post_data']
+                    },
+                    'response': {
+                        'headers': response.get('headers', {}),
+                        'content': response.get('content', {}),
+                        'cookies': response.get('cookies', [])
+                    },
+                    'content_size': response.get('encodedDataLength', 0)
+                })
+    return entries
+
+
+def log_entry(method, params):
+    return {'message': json.dumps({'message': {'method': method, 'params': params}})}
+
+
+def request_sent(request_id, url, method='GET'):
+    return log_entry('Network.requestWillBeSent', {
+        'requestId': request_id,
+        'timestamp': 1.5,
+        'request': {'url': url, 'method': method, 'headers': {'Accept': '*/*'}}
+    })
+
+
+def response_received(request_id, timing=None, size=0, status=200):
+    response = {'status': status, 'mimeType': 'text/html', 'encodedDataLength': size}
+    if timing is not None:
+        response['timing'] = timing
+    return log_entry('Network.responseReceived', {'requestId': request_id, 'response': response})
+
+
+def synthetic_logs(count, seed):
+    rng = random.Random(seed)
+
+    def timing_value():
+        roll = rng.random()
+        if roll < 0.1:
+            return -1
+        if roll < 0.3:
+            return rng.randint(0, 50)
+        return round(rng.uniform(-5, 500), rng.choice([2, 3, 4, 6]))
+
+    logs = [request_sent(str(i), f"https://example.com/{i}") for i in range(count)]
+    for i in range(count):
+        timing = {name: timing_value() for name in TIMING_FIELDS if rng.random() < 0.9} if i % 7 else None
+        logs.append(response_received(str(i), timing, size=i))
+        logs.append(log_entry('Network.dataReceived', {'requestId': str(i), 'dataLength': 10}))
+    return logs
+
+
+class ProcessNetworkDataTests(unittest.TestCase):
+    def test_output_matches_the_original_loop(self):
+        for seed in range(3):
+            logs = synthetic_logs(300, seed)
+            entries, total_size, request_count = process_network_data(logs, 0, 0)
+            expected = reference_process_network_data(logs)
+            # Compare the serialized form so int and float timings must match too
+            self.assertEqual(json.dumps(entries), json.dumps(expected))
+            self.assertEqual(total_size, sum(entry['content_size'] for entry in expected))
+            self.assertEqual(request_count, len(expected))
+
+    def test_timings_are_clamped_and_rounded(self):
+        timing = {'connectStart': 5, 'connectEnd': 2, 'sendEnd': 10, 'receiveHeadersEnd': 12.346, 'responseEnd': 20}
+        entries, _, _ = process_network_data([request_sent('1', 'https://example.com'), response_received('1', timing)], 0, 0)
+        self.assertEqual(entries[0]['timing'], {'connect': 0, 'wait': 2.35, 'receive': 7.65, 'total': 10.0})
+
+    def test_response_without_request_is_ignored(self):
+        entries, total_size, request_count = process_network_data([response_received('missing', size=10)], 0, 0)
+        self.assertEqual((entries, total_size, request_count), ([], 0, 0))
+
+    def test_extra_info_events_are_ignored(self):
+        logs = [
+            request_sent('1', 'https://example.com'),
+            log_entry('Network.requestWillBeSentExtraInfo', {'requestId': '1', 'headers': {}}),
+            log_entry('Network.responseReceivedExtraInfo', {'requestId': '1', 'headers': {}}),
+            response_received('1', size=42),
+        ]
+        entries, total_size, request_count = process_network_data(logs, 0, 0)
+        self.assertEqual(request_count, 1)
+        self.assertEqual(total_size, 42)
+        self.assertEqual(entries[0]['url'], 'https://example.com')
+
+    def test_malformed_entries_are_skipped(self):
+        logs = [{'level': 'INFO'}, {'message': '{"message": {"method": "Network.requestWillBeSent"'}, request_sent('1', 'https://example.com'), response_received('1')]
+        entries, _, request_count = process_network_data(logs, 0, 0)
+        self.assertEqual(request_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,7 +6,7 @@ import Cookies from 'js-cookie';
 interface LogEntry {
   type: string;
   message: string;
-  timestamp: string;
+  timestamp: string | number;  // Epoch milliseconds from the server, ISO string for client-side entries
   details?: any;
 }
 
@@ -39,9 +39,9 @@ export default function ExtractionLogs({ clientId, onComplete }: ExtractionLogsP
   };
 
   // Format timestamp to local time
-  const formatTimestamp = (isoTimestamp: string) => {
+  const formatTimestamp = (timestamp: string | number) => {
     try {
-      return new Date(isoTimestamp).toLocaleTimeString();
+      return new Date(timestamp).toLocaleTimeString();
     } catch (e) {
       return "Unknown time";
     }
@@ -233,7 +233,7 @@ export default function ExtractionLogs({ clientId, onComplete }: ExtractionLogsP
             if (data.type === 'completion') {
               // Extraction completed
               try {
-                const completionData = JSON.parse(data.message);
+                const completionData = typeof data.message === 'string' ? JSON.parse(data.message) : data.message;
                 if (onComplete) {
                   onComplete(completionData);
                 }